@@ -69,6 +69,10 @@ class Settings(BaseSettings):
             path=self.POSTGRES_DB,
         )
 
+    # Use an in-memory SQLite database instead of Postgres, only meant for a
+    # faster local test loop, e.g. TESTING_FAST=1 pytest
+    TESTING_FAST: bool = False
+
     SMTP_TLS: bool = True
     SMTP_SSL: bool = False
     SMTP_PORT: int = 587
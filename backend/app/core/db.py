@@ -1,10 +1,42 @@
-from sqlmodel import Session, create_engine, select
+from typing import Any
+
+from sqlalchemy import Connection, event
+from sqlalchemy.pool import StaticPool
+from sqlmodel import Session, SQLModel, create_engine, select
 
 from app import crud
 from app.core.config import settings
 from app.models import User, UserCreate
 
-engine = create_engine(str(settings.SQLALCHEMY_DATABASE_URI))
+if settings.TESTING_FAST:
+    # StaticPool keeps the single in-memory database shared by all the
+    # sessions and threads
+    engine = create_engine(
+        "sqlite://",
+        connect_args={"check_same_thread": False},
+        poolclass=StaticPool,
+    )
+
+    # Let SQLAlchemy emit BEGIN itself so SAVEPOINTs work with pysqlite
+    # https://docs.sqlalchemy.org/en/20/dialects/sqlite.html#serializable-isolation-savepoints-transactional-ddl
+    @event.listens_for(engine, "connect")
+    def _disable_pysqlite_transactions(dbapi_connection: Any, _: Any) -> None:
+        dbapi_connection.isolation_level = None
+
+    @event.listens_for(engine, "begin")
+    def _begin_sqlite_transaction(connection: Connection) -> None:
+        # All the sessions share the one connection, a session starting while
+        # another one is in a transaction would join it, and its commit would
+        # commit the other one too
+        if connection.connection.dbapi_connection.in_transaction:  # type: ignore[union-attr]
+            raise RuntimeError(
+                "The in-memory SQLite connection is already in a transaction"
+            )
+        connection.exec_driver_sql("BEGIN")
+
+    SQLModel.metadata.create_all(engine)
+else:
+    engine = create_engine(str(settings.SQLALCHEMY_DATABASE_URI))
 
 
 # make sure all SQLModel models are imported (app.models) before initializing DB
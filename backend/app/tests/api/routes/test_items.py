@@ -1,10 +1,13 @@
 import uuid
 
 from fastapi.testclient import TestClient
-from sqlmodel import Session
+from sqlmodel import Session, func, select
 
 from app.core.config import settings
-from app.tests.utils.item import create_random_item
+from app.models import Item, User
+from app.tests.utils.item import create_random_item, create_random_items
+
+ITEMS_URL = f"{settings.API_V1_STR}/items"
 
 
 def test_create_item(
@@ -12,7 +15,7 @@ def test_create_item(
 ) -> None:
     data = {"title": "Foo", "description": "Fighters"}
     response = client.post(
-        f"{settings.API_V1_STR}/items/",
+        f"{ITEMS_URL}/",
         headers=superuser_token_headers,
         json=data,
     )
@@ -25,11 +28,14 @@ def test_create_item(
 
 
 def test_read_item(
-    client: TestClient, superuser_token_headers: dict[str, str], db: Session
+    client: TestClient,
+    superuser_token_headers: dict[str, str],
+    db: Session,
+    default_item_owner: User,
 ) -> None:
-    item = create_random_item(db)
+    item = create_random_item(db, owner_id=default_item_owner.id)
     response = client.get(
-        f"{settings.API_V1_STR}/items/{item.id}",
+        f"{ITEMS_URL}/{item.id}",
         headers=superuser_token_headers,
     )
     assert response.status_code == 200
@@ -44,7 +50,7 @@ def test_read_item_not_found(
     client: TestClient, superuser_token_headers: dict[str, str]
 ) -> None:
     response = client.get(
-        f"{settings.API_V1_STR}/items/{uuid.uuid4()}",
+        f"{ITEMS_URL}/{uuid.uuid4()}",
         headers=superuser_token_headers,
     )
     assert response.status_code == 404
@@ -53,11 +59,14 @@ def test_read_item_not_found(
 
 
 def test_read_item_not_enough_permissions(
-    client: TestClient, normal_user_token_headers: dict[str, str], db: Session
+    client: TestClient,
+    normal_user_token_headers: dict[str, str],
+    db: Session,
+    default_item_owner: User,
 ) -> None:
-    item = create_random_item(db)
+    item = create_random_item(db, owner_id=default_item_owner.id)
     response = client.get(
-        f"{settings.API_V1_STR}/items/{item.id}",
+        f"{ITEMS_URL}/{item.id}",
         headers=normal_user_token_headers,
     )
     assert response.status_code == 400
@@ -66,26 +75,45 @@ def test_read_item_not_enough_permissions(
 
 
 def test_read_items(
-    client: TestClient, superuser_token_headers: dict[str, str], db: Session
+    client: TestClient,
+    superuser_token_headers: dict[str, str],
+    db: Session,
+    default_item_owner: User,
 ) -> None:
-    create_random_item(db)
-    create_random_item(db)
+    items = create_random_items(db, count=2, owner_id=default_item_owner.id)
+    # The superuser sees every item in the database, not only these ones, ask
+    # for all of them so the new items aren't left out of the page
+    count = db.exec(select(func.count()).select_from(Item)).one()
     response = client.get(
-        f"{settings.API_V1_STR}/items/",
+        f"{ITEMS_URL}/",
         headers=superuser_token_headers,
+        params={"limit": count},
     )
     assert response.status_code == 200
     content = response.json()
-    assert len(content["data"]) >= 2
+    assert content["count"] == count
+    expected = {
+        str(item.id): {
+            "id": str(item.id),
+            "title": item.title,
+            "description": item.description,
+            "owner_id": str(item.owner_id),
+        }
+        for item in items
+    }
+    assert expected.items() <= {d["id"]: d for d in content["data"]}.items()
 
 
 def test_update_item(
-    client: TestClient, superuser_token_headers: dict[str, str], db: Session
+    client: TestClient,
+    superuser_token_headers: dict[str, str],
+    db: Session,
+    default_item_owner: User,
 ) -> None:
-    item = create_random_item(db)
+    item = create_random_item(db, owner_id=default_item_owner.id)
     data = {"title": "Updated title", "description": "Updated description"}
     response = client.put(
-        f"{settings.API_V1_STR}/items/{item.id}",
+        f"{ITEMS_URL}/{item.id}",
         headers=superuser_token_headers,
         json=data,
     )
@@ -102,7 +130,7 @@ def test_update_item_not_found(
 ) -> None:
     data = {"title": "Updated title", "description": "Updated description"}
     response = client.put(
-        f"{settings.API_V1_STR}/items/{uuid.uuid4()}",
+        f"{ITEMS_URL}/{uuid.uuid4()}",
         headers=superuser_token_headers,
         json=data,
     )
@@ -112,12 +140,15 @@ def test_update_item_not_found(
 
 
 def test_update_item_not_enough_permissions(
-    client: TestClient, normal_user_token_headers: dict[str, str], db: Session
+    client: TestClient,
+    normal_user_token_headers: dict[str, str],
+    db: Session,
+    default_item_owner: User,
 ) -> None:
-    item = create_random_item(db)
+    item = create_random_item(db, owner_id=default_item_owner.id)
     data = {"title": "Updated title", "description": "Updated description"}
     response = client.put(
-        f"{settings.API_V1_STR}/items/{item.id}",
+        f"{ITEMS_URL}/{item.id}",
         headers=normal_user_token_headers,
         json=data,
     )
@@ -127,11 +158,14 @@ def test_update_item_not_enough_permissions(
 
 
 def test_delete_item(
-    client: TestClient, superuser_token_headers: dict[str, str], db: Session
+    client: TestClient,
+    superuser_token_headers: dict[str, str],
+    db: Session,
+    default_item_owner: User,
 ) -> None:
-    item = create_random_item(db)
+    item = create_random_item(db, owner_id=default_item_owner.id)
     response = client.delete(
-        f"{settings.API_V1_STR}/items/{item.id}",
+        f"{ITEMS_URL}/{item.id}",
         headers=superuser_token_headers,
     )
     assert response.status_code == 200
@@ -143,7 +177,7 @@ def test_delete_item_not_found(
     client: TestClient, superuser_token_headers: dict[str, str]
 ) -> None:
     response = client.delete(
-        f"{settings.API_V1_STR}/items/{uuid.uuid4()}",
+        f"{ITEMS_URL}/{uuid.uuid4()}",
         headers=superuser_token_headers,
     )
     assert response.status_code == 404
@@ -152,11 +186,14 @@ def test_delete_item_not_found(
 
 
 def test_delete_item_not_enough_permissions(
-    client: TestClient, normal_user_token_headers: dict[str, str], db: Session
+    client: TestClient,
+    normal_user_token_headers: dict[str, str],
+    db: Session,
+    default_item_owner: User,
 ) -> None:
-    item = create_random_item(db)
+    item = create_random_item(db, owner_id=default_item_owner.id)
     response = client.delete(
-        f"{settings.API_V1_STR}/items/{item.id}",
+        f"{ITEMS_URL}/{item.id}",
         headers=normal_user_token_headers,
     )
     assert response.status_code == 400
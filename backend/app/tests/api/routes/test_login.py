@@ -8,8 +8,13 @@ from app.core.security import verify_password
 from app.crud import create_user
 from app.models import UserCreate
 from app.tests.utils.user import user_authentication_headers
-from app.tests.utils.utils import random_email, random_lower_string
-from app.utils import generate_password_reset_token
+from app.tests.utils.utils import (
+    password_reset_token,
+    random_email,
+    random_lower_string,
+)
+
+LOGIN_URL = f"{settings.API_V1_STR}/login/access-token"
 
 
 def test_get_access_token(client: TestClient) -> None:
@@ -17,7 +22,7 @@ def test_get_access_token(client: TestClient) -> None:
         "username": settings.FIRST_SUPERUSER,
         "password": settings.FIRST_SUPERUSER_PASSWORD,
     }
-    r = client.post(f"{settings.API_V1_STR}/login/access-token", data=login_data)
+    r = client.post(LOGIN_URL, data=login_data)
     tokens = r.json()
     assert r.status_code == 200
     assert "access_token" in tokens
@@ -29,7 +34,7 @@ def test_get_access_token_incorrect_password(client: TestClient) -> None:
         "username": settings.FIRST_SUPERUSER,
         "password": "incorrect",
     }
-    r = client.post(f"{settings.API_V1_STR}/login/access-token", data=login_data)
+    r = client.post(LOGIN_URL, data=login_data)
     assert r.status_code == 400
 
 
@@ -85,7 +90,7 @@ def test_reset_password(client: TestClient, db: Session) -> None:
         is_superuser=False,
     )
     user = create_user(session=db, user_create=user_create)
-    token = generate_password_reset_token(email=email)
+    token = password_reset_token(email=email)
     headers = user_authentication_headers(client=client, email=email, password=password)
     data = {"new_password": new_password, "token": token}
 
@@ -1,13 +1,16 @@
 import uuid
+from datetime import timedelta
 from unittest.mock import patch
 
 from fastapi.testclient import TestClient
 from sqlmodel import Session, select
 
 from app import crud
+from app.core import security
 from app.core.config import settings
 from app.core.security import verify_password
 from app.models import User, UserCreate
+from app.tests.utils.user import create_random_users
 from app.tests.utils.utils import random_email, random_lower_string
 
 
@@ -33,6 +36,18 @@ def test_get_users_normal_user_me(
     assert current_user["email"] == settings.EMAIL_TEST_USER
 
 
+def test_get_users_me_token_subject_not_uuid(client: TestClient) -> None:
+    access_token = security.create_access_token(
+        "not-a-uuid", expires_delta=timedelta(minutes=5)
+    )
+    r = client.get(
+        f"{settings.API_V1_STR}/users/me",
+        headers={"Authorization": f"Bearer {access_token}"},
+    )
+    assert r.status_code == 403
+    assert r.json() == {"detail": "Could not validate credentials"}
+
+
 def test_create_user_new_email(
     client: TestClient, superuser_token_headers: dict[str, str], db: Session
 ) -> None:
@@ -149,15 +164,7 @@ def test_create_user_by_normal_user(
 def test_retrieve_users(
     client: TestClient, superuser_token_headers: dict[str, str], db: Session
 ) -> None:
-    username = random_email()
-    password = random_lower_string()
-    user_in = UserCreate(email=username, password=password)
-    crud.create_user(session=db, user_create=user_in)
-
-    username2 = random_email()
-    password2 = random_lower_string()
-    user_in2 = UserCreate(email=username2, password=password2)
-    crud.create_user(session=db, user_create=user_in2)
+    create_random_users(db, count=2)
 
     r = client.get(f"{settings.API_V1_STR}/users/", headers=superuser_token_headers)
     all_users = r.json()
@@ -214,21 +221,6 @@ def test_update_password_me(
     assert user_db.email == settings.FIRST_SUPERUSER
     assert verify_password(new_password, user_db.hashed_password)
 
-    # Revert to the old password to keep consistency in test
-    old_data = {
-        "current_password": new_password,
-        "new_password": settings.FIRST_SUPERUSER_PASSWORD,
-    }
-    r = client.patch(
-        f"{settings.API_V1_STR}/users/me/password",
-        headers=superuser_token_headers,
-        json=old_data,
-    )
-    db.refresh(user_db)
-
-    assert r.status_code == 200
-    assert verify_password(settings.FIRST_SUPERUSER_PASSWORD, user_db.hashed_password)
-
 
 def test_update_password_me_incorrect_password(
     client: TestClient, superuser_token_headers: dict[str, str]
@@ -341,7 +333,6 @@ def test_update_user(
 
     user_query = select(User).where(User.email == username)
     user_db = db.exec(user_query).first()
-    db.refresh(user_db)
     assert user_db
     assert user_db.full_name == "Updated_full_name"
 
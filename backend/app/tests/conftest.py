@@ -1,42 +1,130 @@
+import os
 from collections.abc import Generator
+from contextlib import ExitStack
+from unittest.mock import patch
 
 import pytest
 from fastapi.testclient import TestClient
-from sqlmodel import Session, delete
+from passlib.context import CryptContext
+from sqlalchemy import Engine, QueuePool, text
+from sqlmodel import Session, SQLModel, col, delete
 
+from app.api.deps import get_db
+from app.core import security
 from app.core.config import settings
 from app.core.db import engine, init_db
 from app.main import app
-from app.models import Item, User
-from app.tests.utils.user import authentication_token_from_email
+from app.models import User
+from app.tests.utils.user import authentication_token_from_email, create_random_user
 from app.tests.utils.utils import get_superuser_token_headers
 
 
 @pytest.fixture(scope="session", autouse=True)
-def db() -> Generator[Session, None, None]:
-    with Session(engine) as session:
+def fast_password_hashing() -> Generator[None, None, None]:
+    # Use the minimum bcrypt cost in tests, the code paths stay the same but
+    # each hash is ~256x cheaper than with the default cost
+    with pytest.MonkeyPatch.context() as mp:
+        mp.setattr(
+            security,
+            "pwd_context",
+            CryptContext(schemes=["bcrypt"], deprecated="auto", bcrypt__rounds=4),
+        )
+        yield
+
+
+@pytest.fixture(scope="session")
+def db_engine() -> Generator[Engine, None, None]:
+    # With pytest-xdist every worker gets its own schema, so workers don't
+    # see each other's users and items, the in-memory SQLite database is
+    # already private to each worker
+    worker = os.environ.get("PYTEST_XDIST_WORKER")
+    if not worker or settings.TESTING_FAST:
+        yield engine
+        return
+
+    schema = f"test_{worker}"
+    with engine.begin() as connection:
+        connection.execute(text(f"CREATE SCHEMA IF NOT EXISTS {schema}"))
+    worker_engine = engine.execution_options(schema_translate_map={None: schema})
+    SQLModel.metadata.create_all(worker_engine)
+
+    def get_worker_db() -> Generator[Session, None, None]:
+        with Session(worker_engine) as session:
+            yield session
+
+    with patch.dict(app.dependency_overrides, {get_db: get_worker_db}):
+        yield worker_engine
+    with engine.begin() as connection:
+        connection.execute(text(f"DROP SCHEMA IF EXISTS {schema} CASCADE"))
+
+
+@pytest.fixture(scope="session", autouse=True)
+def warm_up_db_pool(db_engine: Engine) -> None:
+    # Open all the pooled connections at once before the first test, instead
+    # of paying the connection setup during it
+    pool = db_engine.pool
+    if not isinstance(pool, QueuePool):
+        return
+    with ExitStack() as stack:
+        for _ in range(pool.size()):
+            connection = stack.enter_context(db_engine.connect())
+            connection.execute(text("SELECT 1"))
+
+
+@pytest.fixture(scope="session", autouse=True)
+def initial_data(db_engine: Engine) -> None:
+    with Session(db_engine) as session:
         init_db(session)
-        yield session
-        statement = delete(Item)
-        session.execute(statement)
-        statement = delete(User)
-        session.execute(statement)
+
+
+@pytest.fixture(scope="session")
+def default_item_owner(db_engine: Engine) -> Generator[User, None, None]:
+    # Owner for items in tests that don't care who owns them, created once
+    # outside the per test transaction
+    with Session(db_engine, expire_on_commit=False) as session:
+        user = create_random_user(session)
         session.commit()
+    yield user
+    with Session(db_engine) as session:
+        session.execute(delete(User).where(col(User.id) == user.id))
+        session.commit()
+
+
+@pytest.fixture(autouse=True)
+def db(db_engine: Engine) -> Generator[Session, None, None]:
+    # Run every test inside an outer transaction that is rolled back at the
+    # end, commits from the test or the API only release a SAVEPOINT
+    connection = db_engine.connect()
+    transaction = connection.begin()
+    session = Session(bind=connection, join_transaction_mode="create_savepoint")
+    with patch.dict(app.dependency_overrides, {get_db: lambda: session}):
+        yield session
+    session.close()
+    transaction.rollback()
+    connection.close()
 
 
-@pytest.fixture(scope="module")
+@pytest.fixture(scope="session")
 def client() -> Generator[TestClient, None, None]:
+    # Entered once so the app lifespan runs once per session. The app has no
+    # startup or shutdown handlers, the only app state changed by tests is
+    # dependency_overrides, which db restores after every test
     with TestClient(app) as c:
         yield c
 
 
-@pytest.fixture(scope="module")
+@pytest.fixture(scope="session")
 def superuser_token_headers(client: TestClient) -> dict[str, str]:
+    # The superuser is created by initial_data and is never rolled back, so a
+    # single login is enough for the whole session
     return get_superuser_token_headers(client)
 
 
-@pytest.fixture(scope="module")
-def normal_user_token_headers(client: TestClient, db: Session) -> dict[str, str]:
-    return authentication_token_from_email(
-        client=client, email=settings.EMAIL_TEST_USER, db=db
-    )
+@pytest.fixture(scope="session")
+def normal_user_token_headers(db_engine: Engine) -> dict[str, str]:
+    # The test user has to outlive the per test transaction, changes made to it
+    # by tests are rolled back, so one token is enough for the whole session
+    with Session(db_engine) as session:
+        return authentication_token_from_email(
+            email=settings.EMAIL_TEST_USER, db=session
+        )
@@ -1,16 +1,26 @@
+import uuid
+
 from sqlmodel import Session
 
-from app import crud
-from app.models import Item, ItemCreate
-from app.tests.utils.user import create_random_user
+from app.models import Item
 from app.tests.utils.utils import random_lower_string
 
 
-def create_random_item(db: Session) -> Item:
-    user = create_random_user(db)
-    owner_id = user.id
-    assert owner_id is not None
-    title = random_lower_string()
-    description = random_lower_string()
-    item_in = ItemCreate(title=title, description=description)
-    return crud.create_item(session=db, item_in=item_in, owner_id=owner_id)
+def create_random_item(db: Session, *, owner_id: uuid.UUID) -> Item:
+    return create_random_items(db, count=1, owner_id=owner_id)[0]
+
+
+def create_random_items(db: Session, *, count: int, owner_id: uuid.UUID) -> list[Item]:
+    # Ids are generated client side, so a single flush inserts all the rows
+    # without refreshing them one by one
+    items = [
+        Item(
+            title=random_lower_string(),
+            description=random_lower_string(),
+            owner_id=owner_id,
+        )
+        for _ in range(count)
+    ]
+    db.add_all(items)
+    db.flush()
+    return items
@@ -1,15 +1,32 @@
+import functools
+import uuid
+from datetime import timedelta
+
 from fastapi.testclient import TestClient
 from sqlmodel import Session
 
 from app import crud
+from app.core import security
 from app.core.config import settings
-from app.models import User, UserCreate, UserUpdate
-from app.tests.utils.utils import random_email, random_lower_string
+from app.core.security import get_password_hash
+from app.models import User, UserCreate
+from app.tests.utils.utils import (
+    cache_per_secret_key,
+    random_email,
+    random_lower_string,
+)
 
 
 def user_authentication_headers(
     *, client: TestClient, email: str, password: str
 ) -> dict[str, str]:
+    """
+    Return headers with a token obtained by logging in through the API.
+
+    Pass the session-scoped `client` fixture instead of a new `TestClient`,
+    so the app lifespan isn't started again for each login. Use
+    `user_access_token_headers` when the login itself isn't being tested.
+    """
     data = {"username": email, "password": password}
 
     r = client.post(f"{settings.API_V1_STR}/login/access-token", data=data)
@@ -19,31 +36,57 @@ def user_authentication_headers(
     return headers
 
 
+def user_access_token_headers(user_id: uuid.UUID) -> dict[str, str]:
+    """
+    Return headers with a valid token for the user with given id.
+
+    The token is signed directly, without logging in through the API.
+    """
+    access_token = _signed_access_token(user_id)
+    return {"Authorization": f"Bearer {access_token}"}
+
+
+@cache_per_secret_key
+def _signed_access_token(user_id: uuid.UUID) -> str:
+    return security.create_access_token(
+        user_id, expires_delta=timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES)
+    )
+
+
+@functools.cache
+def _random_password_hash() -> str:
+    return get_password_hash(random_lower_string())
+
+
 def create_random_user(db: Session) -> User:
-    email = random_email()
-    password = random_lower_string()
-    user_in = UserCreate(email=email, password=password)
-    user = crud.create_user(session=db, user_create=user_in)
+    # The password is never given back to the caller, so all the random users
+    # can share a single hash instead of running bcrypt for each of them
+    user = User(email=random_email(), hashed_password=_random_password_hash())
+    db.add(user)
+    db.flush()
     return user
 
 
-def authentication_token_from_email(
-    *, client: TestClient, email: str, db: Session
-) -> dict[str, str]:
+def create_random_users(db: Session, *, count: int) -> list[User]:
+    hashed_password = _random_password_hash()
+    users = [
+        User(email=random_email(), hashed_password=hashed_password)
+        for _ in range(count)
+    ]
+    db.add_all(users)
+    db.flush()
+    return users
+
+
+def authentication_token_from_email(*, email: str, db: Session) -> dict[str, str]:
     """
     Return a valid token for the user with given email.
 
     If the user doesn't exist it is created first.
     """
-    password = random_lower_string()
     user = crud.get_user_by_email(session=db, email=email)
     if not user:
-        user_in_create = UserCreate(email=email, password=password)
+        user_in_create = UserCreate(email=email, password=random_lower_string())
         user = crud.create_user(session=db, user_create=user_in_create)
-    else:
-        user_in_update = UserUpdate(password=password)
-        if not user.id:
-            raise Exception("User id not set")
-        user = crud.update_user(session=db, db_user=user, user_in=user_in_update)
 
-    return user_authentication_headers(client=client, email=email, password=password)
+    return user_access_token_headers(user.id)
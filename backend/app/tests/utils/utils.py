@@ -1,17 +1,42 @@
+import functools
 import random
 import string
+import threading
+from collections.abc import Callable, Hashable
 
 from fastapi.testclient import TestClient
 
 from app.core.config import settings
+from app.utils import generate_password_reset_token
+
+_STRING_LENGTH = 32
+_POOL_SIZE = 1024
+_string_pool: list[str] = []
+_string_pool_lock = threading.Lock()
+
+
+def _refill_string_pool() -> None:
+    # One call to random.choices for the whole pool, sliced into strings
+    chars = "".join(
+        random.choices(string.ascii_lowercase, k=_STRING_LENGTH * _POOL_SIZE)
+    )
+    _string_pool.extend(
+        chars[i : i + _STRING_LENGTH] for i in range(0, len(chars), _STRING_LENGTH)
+    )
 
 
 def random_lower_string() -> str:
-    return "".join(random.choices(string.ascii_lowercase, k=32))
+    with _string_pool_lock:
+        if not _string_pool:
+            _refill_string_pool()
+        return _string_pool.pop()
 
 
 def random_email() -> str:
-    return f"{random_lower_string()}@{random_lower_string()}.com"
+    # Both parts come from a single pooled string
+    name = random_lower_string()
+    half = _STRING_LENGTH // 2
+    return f"{name[:half]}@{name[half:]}.com"
 
 
 def get_superuser_token_headers(client: TestClient) -> dict[str, str]:
@@ -24,3 +49,23 @@ def get_superuser_token_headers(client: TestClient) -> dict[str, str]:
     a_token = tokens["access_token"]
     headers = {"Authorization": f"Bearer {a_token}"}
     return headers
+
+
+def cache_per_secret_key(func: Callable[..., str]) -> Callable[..., str]:
+    # Signing the same payload again would produce an equivalent token. The
+    # current secret key is part of the cache key, so a test that patches
+    # settings.SECRET_KEY gets a token signed with the new key. A cached token
+    # keeps the "exp" of the first call, the session is much shorter than the
+    # expiration of the tokens
+    @functools.lru_cache(maxsize=64)
+    def cached(_secret_key: str, *args: Hashable, **kwargs: Hashable) -> str:
+        return func(*args, **kwargs)
+
+    @functools.wraps(func)
+    def wrapper(*args: Hashable, **kwargs: Hashable) -> str:
+        return cached(settings.SECRET_KEY, *args, **kwargs)
+
+    return wrapper
+
+
+password_reset_token = cache_per_secret_key(generate_password_reset_token)